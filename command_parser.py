@@ -1,7 +1,8 @@
 """
 Command Parser for USB Relay Network Controller
 
-Parses and validates plain text commands received over network.
+Parses and validates plain text commands received over network in a
+single pass, directly from the received bytes (ASCII protocol).
 
 Supported command format:
 - OPEN <channel>      # Open relay channel 1-8
@@ -13,54 +14,73 @@ Supported command format:
 - HELP               # Show available commands
 """
 
+import functools
 import logging
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# ASCII-only uppercase table for bytes.translate (single C-level pass)
+_UPPER_TABLE = bytes.maketrans(b"abcdefghijklmnopqrstuvwxyz",
+                               b"ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
-@dataclass
+# Action discriminants (compared as ints on the hot path)
+OPEN, CLOSE, TOGGLE, STATUS, HELP = range(5)
+ACTION_NAMES = ("OPEN", "CLOSE", "TOGGLE", "STATUS", "HELP")
+
+
+@dataclass(slots=True)
 class Command:
     """Parsed command data structure"""
-    action: str  # OPEN, CLOSE, STATUS, TOGGLE, HELP
-    target: Optional[str] = None  # channel number, "ALL", or None
-    raw_command: str = ""
+    action: int  # OPEN, CLOSE, TOGGLE, STATUS, HELP
+    target: Optional[bytes] = None  # channel number, b"ALL", or None
+    raw_command: bytes = b""  # as received (unstripped), kept for logging
+    channel_int: Optional[int] = None  # target as a number, set once by the parser
+    all_channels: bool = False  # target is ALL
 
     @property
     def is_help(self) -> bool:
-        return self.action == "HELP"
+        return self.action == HELP
 
     @property
     def is_status(self) -> bool:
-        return self.action == "STATUS"
+        return self.action == STATUS
 
     @property
     def is_toggle(self) -> bool:
-        return self.action == "TOGGLE"
+        return self.action == TOGGLE
 
     @property
     def is_open(self) -> bool:
-        return self.action == "OPEN"
+        return self.action == OPEN
 
     @property
     def is_close(self) -> bool:
-        return self.action == "CLOSE"
+        return self.action == CLOSE
 
     @property
     def channel(self) -> Optional[int]:
         """Get channel as integer, or None if ALL or not a channel command"""
-        if self.target and self.target.upper() != "ALL":
-            try:
-                return int(self.target)
-            except ValueError:
-                return None
-        return None
+        return self.channel_int
 
     @property
     def is_all_channels(self) -> bool:
         """Check if command targets all channels"""
-        return self.target and self.target.upper() == "ALL"
+        return self.all_channels
+
+
+def _text(value: bytes) -> str:
+    """Decode protocol bytes for messages and logs"""
+    return value.decode('utf-8', errors='replace')
+
+
+@functools.lru_cache(maxsize=256)
+def _error_response(type_name: Optional[str], message: str) -> bytes:
+    """Encode an error response line (memoized; the same errors repeat)"""
+    if type_name is None:
+        return f"ERROR: {message}\n".encode('utf-8')
+    return f"ERROR: {type_name}: {message}\n".encode('utf-8')
 
 
 class CommandParserError(Exception):
@@ -80,9 +100,14 @@ class CommandParser:
     Thread-safe and stateless - can be used from multiple connections.
     """
 
-    VALID_ACTIONS = {"OPEN", "CLOSE", "STATUS", "TOGGLE", "HELP"}
-    CHANNEL_ACTIONS = {"OPEN", "CLOSE", "TOGGLE"}  # Actions that accept a target
-    NO_TARGET_ACTIONS = {"STATUS", "HELP"}  # Actions that don't need a target
+    # Dispatch table: action name -> (accepts_target, action id)
+    _ACTIONS = {
+        b"OPEN": (True, OPEN),
+        b"CLOSE": (True, CLOSE),
+        b"TOGGLE": (True, TOGGLE),
+        b"STATUS": (False, STATUS),
+        b"HELP": (False, HELP),
+    }
 
     HELP_TEXT = """Available Commands:
 OPEN             - Open (activate) all relay channels
@@ -100,6 +125,7 @@ Examples:
   CLOSE 3
   STATUS
 """
+    HELP_TEXT_BYTES = HELP_TEXT.encode('utf-8') + b"\n"  # wire form, encoded once
 
     def __init__(self, max_channels: int = 8):
         """
@@ -110,117 +136,102 @@ Examples:
         """
         self.max_channels = max_channels
 
-    def parse(self, command_str: str) -> Command:
+    def parse(self, data: Union[bytes, str]) -> Command:
         """
-        Parse a plain text command string
+        Parse and validate a plain text command
 
         Args:
-            command_str: Raw command string from network client
+            data: Raw command bytes from network client (str is also accepted)
 
         Returns:
             Command: Parsed command object
 
         Raises:
-            InvalidCommandError: If command syntax is invalid
+            InvalidCommandError: If command syntax or channel is invalid
         """
-        # Clean and normalize input
-        command_str = command_str.strip()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
 
-        if not command_str:
-            raise InvalidCommandError("Empty command")
-
-        # Store raw command for logging
-        raw = command_str
-
-        # Split into parts
-        parts = command_str.upper().split()
+        # Uppercase (ASCII) and split; at most action, target and the rest.
+        # split() already skips surrounding whitespace, so no strip() copy.
+        parts = data.translate(_UPPER_TABLE).split(None, 2)
 
         if not parts:
             raise InvalidCommandError("Empty command")
 
-        action = parts[0]
+        name = parts[0]
+        entry = self._ACTIONS.get(name)
 
-        # Validate action
-        if action not in self.VALID_ACTIONS:
+        if entry is None:
             raise InvalidCommandError(
-                f"Unknown action: {action}. Type HELP for available commands."
+                f"Unknown action: {_text(name)}. Type HELP for available commands."
             )
 
-        # Parse based on action type
-        if action in self.NO_TARGET_ACTIONS:
+        accepts_target, action = entry
+
+        if not accepts_target:
             # STATUS or HELP - no target needed
             if len(parts) > 1:
-                logger.warning(f"Extra arguments ignored for {action} command")
-            return Command(action=action, target=None, raw_command=raw)
+                logger.warning("Extra arguments ignored for %s command", ACTION_NAMES[action])
+            return Command(action=action, target=None, raw_command=data)
+
+        # OPEN, CLOSE, TOGGLE - optional target (defaults to ALL for OPEN/CLOSE)
+        if len(parts) < 2:
+            if action != TOGGLE:
+                # OPEN/CLOSE without target = ALL channels
+                return Command(action=action, target=b"ALL", raw_command=data,
+                               all_channels=True)
+            name = ACTION_NAMES[action]
+            raise InvalidCommandError(
+                f"{name} requires a channel number. Example: {name} 1"
+            )
 
-        elif action in self.CHANNEL_ACTIONS:
-            # OPEN, CLOSE, TOGGLE - optional target (defaults to ALL for OPEN/CLOSE)
-            if len(parts) < 2:
-                if action in ("OPEN", "CLOSE"):
-                    # OPEN/CLOSE without target = ALL channels
-                    return Command(action=action, target="ALL", raw_command=raw)
-                else:
-                    raise InvalidCommandError(
-                        f"{action} requires a channel number. Example: {action} 1"
-                    )
+        target = parts[1]
 
-            target = parts[1]
+        if len(parts) > 2:
+            logger.warning("Extra arguments ignored: %s", _text(parts[2].strip()))
 
-            if len(parts) > 2:
-                logger.warning(f"Extra arguments ignored: {' '.join(parts[2:])}")
+        # Convert and validate the target in the same pass
+        if target == b"ALL":
+            return Command(action=action, target=target, raw_command=data,
+                           all_channels=True)
 
-            return Command(action=action, target=target, raw_command=raw)
+        try:
+            channel = int(target)
+        except ValueError:
+            raise InvalidCommandError(
+                f"Invalid channel: {_text(target)}. "
+                f"Must be a number 1-{self.max_channels} or ALL"
+            )
 
-        else:
-            raise InvalidCommandError(f"Unhandled action: {action}")
+        if not (1 <= channel <= self.max_channels):
+            raise InvalidCommandError(
+                f"Channel {channel} out of range. "
+                f"Valid range: 1-{self.max_channels}"
+            )
+
+        return Command(action=action, target=target, raw_command=data,
+                       channel_int=channel)
 
     def validate(self, command: Command) -> None:
         """
         Validate a parsed command
 
+        Kept for API compatibility; parse() already rejects invalid
+        commands, so there is nothing left to check.
+
         Args:
             command: Parsed command to validate
-
-        Raises:
-            InvalidCommandError: If command is invalid
         """
-        # No validation needed for HELP or STATUS
-        if command.is_help or command.is_status:
-            return
-
-        # Validate channel commands
-        if command.action in self.CHANNEL_ACTIONS:
-            if not command.target:
-                raise InvalidCommandError(
-                    f"{command.action} requires a channel number or ALL"
-                )
-
-            # Check if it's ALL
-            if command.is_all_channels:
-                return  # ALL is valid
-
-            # Validate channel number
-            try:
-                channel = int(command.target)
-            except ValueError:
-                raise InvalidCommandError(
-                    f"Invalid channel: {command.target}. "
-                    f"Must be a number 1-{self.max_channels} or ALL"
-                )
-
-            # Check channel range
-            if not (1 <= channel <= self.max_channels):
-                raise InvalidCommandError(
-                    f"Channel {channel} out of range. "
-                    f"Valid range: 1-{self.max_channels}"
-                )
-
-    def parse_and_validate(self, command_str: str) -> Command:
+
+    def parse_and_validate(self, data: Union[bytes, str]) -> Command:
         """
         Parse and validate a command in one call
 
+        Equivalent to parse(), which validates while parsing.
+
         Args:
-            command_str: Raw command string
+            data: Raw command bytes
 
         Returns:
             Command: Validated command object
@@ -228,11 +239,9 @@ Examples:
         Raises:
             InvalidCommandError: If command is invalid
         """
-        command = self.parse(command_str)
-        self.validate(command)
-        return command
+        return self.parse(data)
 
-    def format_error(self, error: Exception) -> str:
+    def format_error(self, error: Exception) -> bytes:
         """
         Format an error message for network clients
 
@@ -240,12 +249,12 @@ Examples:
             error: Exception that occurred
 
         Returns:
-            str: Formatted error message
+            bytes: Formatted, newline-terminated error response
         """
         if isinstance(error, InvalidCommandError):
-            return f"ERROR: {str(error)}"
+            return _error_response(None, str(error))
         else:
-            return f"ERROR: {type(error).__name__}: {str(error)}"
+            return _error_response(type(error).__name__, str(error))
 
     def get_help(self) -> str:
         """
@@ -7,8 +7,11 @@ Both servers run in the same asyncio event loop.
 
 import asyncio
 import logging
-from typing import Optional
-from command_parser import CommandParser, Command, InvalidCommandError
+import socket
+from typing import Dict, List, Optional
+from command_parser import (
+    CommandParser, Command, InvalidCommandError, OPEN, CLOSE, TOGGLE, STATUS, HELP
+)
 from usb_relay import USBRelayController
 
 logger = logging.getLogger(__name__)
@@ -18,9 +21,24 @@ class RelayCommandHandler:
     """
     Handles relay commands from network clients
 
-    Shared by both TCP and UDP servers.
+    Shared by both TCP and UDP servers. Responses are returned as
+    newline-terminated bytes, ready to be written to the client.
     """
 
+    # Pre-encoded responses
+    RESPONSE_OK = b"OK\n"
+    ERR_TEMPLATES = {
+        'open': b"ERROR: Failed to open channel %d\n",
+        'close': b"ERROR: Failed to close channel %d\n",
+        'toggle_status': b"ERROR: Cannot get status for channel %d\n",
+        'open_all': b"ERROR: Failed to open all channels\n",
+        'close_all': b"ERROR: Failed to close all channels\n",
+        'toggle_target': b"ERROR: TOGGLE requires a channel number\n",
+        'status': b"ERROR: Unable to get relay status\n",
+        'internal': b"ERROR: Internal server error\n",
+        'unknown': b"ERROR: Unknown command\n",
+    }
+
     def __init__(self, relay_controller: USBRelayController, parser: CommandParser):
         """
         Initialize command handler
@@ -32,36 +50,62 @@ class RelayCommandHandler:
         self.relay = relay_controller
         self.parser = parser
 
-    async def handle_command(self, command_str: str, client_addr: str) -> str:
+        # Per-channel error responses for every channel the parser accepts
+        channels = range(1, parser.max_channels + 1)
+        self._err_open = {ch: self.ERR_TEMPLATES['open'] % ch for ch in channels}
+        self._err_close = {ch: self.ERR_TEMPLATES['close'] % ch for ch in channels}
+        self._err_toggle_status = {
+            ch: self.ERR_TEMPLATES['toggle_status'] % ch for ch in channels
+        }
+
+        # STATUS fragments indexed by channel (index 0 unused). Auto-detected
+        # boards have at most 8 channels; a configured count may be larger.
+        width = max(parser.max_channels, 8)
+        self._ch_open = [f"CH{ch}=OPEN".encode() for ch in range(width + 1)]
+        self._ch_closed = [f"CH{ch}=CLOSED".encode() for ch in range(width + 1)]
+        self._serial_prefix: Dict[str, bytes] = {}  # serial -> b"[serial] "
+
+        # OPEN/CLOSE dispatch: (action, all_channels) ->
+        #   (relay method, error response or per-channel table)
+        self._dispatch = {
+            (OPEN, False): (relay_controller.open_channel, self._err_open),
+            (OPEN, True): (relay_controller.open_all_channels, self.ERR_TEMPLATES['open_all']),
+            (CLOSE, False): (relay_controller.close_channel, self._err_close),
+            (CLOSE, True): (relay_controller.close_all_channels, self.ERR_TEMPLATES['close_all']),
+        }
+
+    async def handle_command(self, data: bytes, client_addr: str) -> bytes:
         """
         Process a command and return response
 
         Args:
-            command_str: Raw command string
+            data: Raw command bytes as received from the client
             client_addr: Client address for logging
 
         Returns:
-            str: Response message
+            bytes: Response message
         """
         try:
             # Parse and validate command
-            command = self.parser.parse_and_validate(command_str)
+            command = self.parser.parse_and_validate(data)
 
-            logger.info(f"Command from {client_addr}: {command.raw_command}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Command from %s: %s", client_addr,
+                            command.raw_command.strip().decode('utf-8', 'replace'))
 
             # Execute command
             response = await self._execute_command(command)
             return response
 
         except InvalidCommandError as e:
-            logger.warning(f"Invalid command from {client_addr}: {e}")
+            logger.warning("Invalid command from %s: %s", client_addr, e)
             return self.parser.format_error(e)
 
         except Exception as e:
-            logger.error(f"Error handling command from {client_addr}: {e}", exc_info=True)
-            return f"ERROR: Internal server error"
+            logger.error("Error handling command from %s: %s", client_addr, e, exc_info=True)
+            return self.ERR_TEMPLATES['internal']
 
-    async def _execute_command(self, command: Command) -> str:
+    async def _execute_command(self, command: Command) -> bytes:
         """
         Execute a parsed and validated command
 
@@ -69,79 +113,91 @@ class RelayCommandHandler:
             command: Parsed command
 
         Returns:
-            str: Response message
+            bytes: Response message
         """
+        ok = self.RESPONSE_OK
+        err = self.ERR_TEMPLATES
+        action = command.action  # integer discriminant, compared directly
+
         # Handle HELP
-        if command.is_help:
-            return self.parser.get_help()
+        if action == HELP:
+            return self.parser.HELP_TEXT_BYTES
 
         # Handle STATUS
-        if command.is_status:
+        if action == STATUS:
             status = await self.relay.get_status()
             if not status:
-                return "ERROR: Unable to get relay status"
+                return err['status']
 
             # Format per-device status response
             # status is Dict[serial, Dict[channel, bool]]
+            # Channels are walked in order instead of sorting each dict
+            ch_open = self._ch_open
+            ch_closed = self._ch_closed
+            channel_range = range(1, len(ch_open))
             parts = []
             for serial, channels in sorted(status.items()):
-                ch_parts = [f"CH{ch}={'OPEN' if state else 'CLOSED'}"
-                            for ch, state in sorted(channels.items())]
-                parts.append(f"[{serial}] " + ",".join(ch_parts))
-            return "STATUS: " + " | ".join(parts)
-
-        # Handle OPEN
-        if command.is_open:
-            if command.is_all_channels:
-                success = await self.relay.open_all_channels()
-                return "OK" if success else "ERROR: Failed to open all channels"
-            else:
-                channel = command.channel
-                success = await self.relay.open_channel(channel)
-                return "OK" if success else f"ERROR: Failed to open channel {channel}"
-
-        # Handle CLOSE
-        if command.is_close:
-            if command.is_all_channels:
-                success = await self.relay.close_all_channels()
-                return "OK" if success else "ERROR: Failed to close all channels"
-            else:
-                channel = command.channel
-                success = await self.relay.close_channel(channel)
-                return "OK" if success else f"ERROR: Failed to close channel {channel}"
+                prefix = self._serial_prefix.get(serial)
+                if prefix is None:
+                    prefix = self._serial_prefix[serial] = f"[{serial}] ".encode('utf-8')
+                fragments = []
+                for ch in channel_range:
+                    state = channels.get(ch)
+                    if state is not None:
+                        fragments.append(ch_open[ch] if state else ch_closed[ch])
+                parts.append(prefix + b",".join(fragments))
+            return b"STATUS: " + b" | ".join(parts) + b"\n"
+
+        # Handle OPEN / CLOSE
+        entry = self._dispatch.get((action, command.all_channels))
+        if entry is not None:
+            method, error = entry
+            if command.all_channels:
+                return ok if await method() else error
+            channel = command.channel_int
+            return ok if await method(channel) else error[channel]
 
         # Handle TOGGLE
-        if command.is_toggle:
-            channel = command.channel
+        if action == TOGGLE:
+            channel = command.channel_int
             if not channel:
-                return "ERROR: TOGGLE requires a channel number"
+                return err['toggle_target']
 
-            # Get current status (per-device dict)
+            # Current status (served from the controller's state cache, which
+            # it keeps fresh); the first device is the reference for the
+            # toggle direction
             status = await self.relay.get_status()
             if not status:
-                return f"ERROR: Cannot get status for channel {channel}"
+                return self._err_toggle_status[channel]
+            current_state = next(iter(status.values())).get(channel)
+            if current_state is None:
+                return self._err_toggle_status[channel]
 
-            # Use first device's state as reference for toggle direction
-            first_device_channels = next(iter(status.values()))
-            if channel not in first_device_channels:
-                return f"ERROR: Cannot get status for channel {channel}"
+            method, error = self._dispatch[(CLOSE if current_state else OPEN, False)]
+            return ok if await method(channel) else error[channel]
 
-            current_state = first_device_channels[channel]
-            if current_state:
-                success = await self.relay.close_channel(channel)
-                return "OK" if success else f"ERROR: Failed to close channel {channel}"
-            else:
-                success = await self.relay.open_channel(channel)
-                return "OK" if success else f"ERROR: Failed to open channel {channel}"
-
-        return "ERROR: Unknown command"
+        return err['unknown']
 
 
 class TCPServer:
-    """Async TCP server for relay commands"""
+    """
+    Async TCP server for relay commands
+
+    Commands are newline-terminated; a client may send several commands
+    over one connection and gets one response line per command.
+    """
+
+    # Maximum length of a single command line (bytes)
+    MAX_LINE = 1024
+
+    # Default seconds to wait for the next command before closing
+    IDLE_TIMEOUT = 5.0
+
+    RESPONSE_TOO_LONG = b"ERROR: Command too long\n"
 
     def __init__(self, handler: RelayCommandHandler,
-                 host: str = "0.0.0.0", port: int = 5000):
+                 host: str = "0.0.0.0", port: int = 5000,
+                 idle_timeout: float = IDLE_TIMEOUT):
         """
         Initialize TCP server
 
@@ -149,10 +205,12 @@ class TCPServer:
             handler: Command handler instance
             host: Bind host
             port: Bind port
+            idle_timeout: Seconds to wait for the next command before closing
         """
         self.handler = handler
         self.host = host
         self.port = port
+        self.idle_timeout = idle_timeout
         self._server: Optional[asyncio.Server] = None
 
     async def handle_client(self, reader: asyncio.StreamReader,
@@ -168,27 +226,69 @@ class TCPServer:
         client_ip = addr[0] if addr else "unknown"
         client_port = addr[1] if addr else 0
 
-        logger.info(f"TCP connection from {client_ip}:{client_port}")
-
-        try:
-            # Read command (up to 1KB)
-            data = await reader.read(1024)
+        logger.info("TCP connection from %s:%s", client_ip, client_port)
 
-            if not data:
-                return
-
-            # Decode and process command
-            command_str = data.decode('utf-8').strip()
+        # Disable Nagle's algorithm so the short response is sent immediately
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
 
-            # Handle command
-            response = await self.handler.handle_command(command_str, f"{client_ip}:{client_port}")
+        client_addr = f"{client_ip}:{client_port}"
 
-            # Send response
-            writer.write(response.encode('utf-8') + b'\n')
-            await writer.drain()
+        # Lines are framed here rather than with readuntil() so that a
+        # trailing command without a newline is still reachable when the
+        # client goes quiet or closes its side
+        buf = bytearray()
+        try:
+            while True:
+                # Take one command line (up to MAX_LINE bytes) from the buffer
+                end = buf.find(b'\n')
+                if end >= self.MAX_LINE or (end < 0 and len(buf) >= self.MAX_LINE):
+                    writer.write(self.RESPONSE_TOO_LONG)
+                    await writer.drain()
+                    break
+
+                last = False
+                if end < 0:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            reader.read(self.MAX_LINE), timeout=self.idle_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        logger.debug("TCP connection idle, closing: %s", client_addr)
+                        chunk = b""
+                    if chunk:
+                        buf += chunk
+                        continue
+                    # EOF or idle timeout: run a final command that lacks a newline
+                    if not buf or buf.isspace():
+                        break
+                    end = len(buf) - 1
+                    last = True
+
+                line = bytes(buf[:end + 1])
+                del buf[:end + 1]
+
+                if line.isspace():
+                    continue
+
+                # Handle command (parsed directly from bytes)
+                response = await self.handler.handle_command(line, client_addr)
+
+                # Send response (already newline-terminated). It normally goes
+                # straight to the socket; only wait if some of it was buffered.
+                writer.write(response)
+                if writer.transport.get_write_buffer_size() > 0:
+                    await writer.drain()
+
+                if last:
+                    break
 
         except Exception as e:
-            logger.error(f"Error handling TCP client {client_ip}:{client_port}: {e}")
+            logger.error("Error handling TCP client %s:%s: %s", client_ip, client_port, e)
 
         finally:
             try:
@@ -197,7 +297,7 @@ class TCPServer:
             except Exception:
                 pass
 
-            logger.debug(f"TCP connection closed: {client_ip}:{client_port}")
+            logger.debug("TCP connection closed: %s:%s", client_ip, client_port)
 
     async def start(self) -> None:
         """Start the TCP server"""
@@ -207,7 +307,7 @@ class TCPServer:
             self.port
         )
 
-        logger.info(f"TCP server listening on {self.host}:{self.port}")
+        logger.info("TCP server listening on %s:%s", self.host, self.port)
 
     async def stop(self) -> None:
         """Stop the TCP server"""
@@ -218,7 +318,18 @@ class TCPServer:
 
 
 class UDPServer(asyncio.DatagramProtocol):
-    """Async UDP server for relay commands"""
+    """
+    Async UDP server for relay commands
+
+    Datagrams are queued and processed by a fixed number of long-lived
+    worker tasks instead of spawning a task per datagram.
+    """
+
+    # Number of worker tasks draining the datagram queue
+    WORKER_COUNT = 2
+
+    # Maximum queued datagrams; further datagrams are dropped
+    QUEUE_SIZE = 1024
 
     def __init__(self, handler: RelayCommandHandler):
         """
@@ -229,10 +340,16 @@ class UDPServer(asyncio.DatagramProtocol):
         """
         self.handler = handler
         self.transport: Optional[asyncio.DatagramTransport] = None
+        self.dropped = 0  # datagrams dropped because the queue was full
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._workers: List[asyncio.Task] = []
 
     def connection_made(self, transport: asyncio.DatagramTransport) -> None:
         """Called when connection is established"""
         self.transport = transport
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.WORKER_COUNT)
+        ]
 
     def datagram_received(self, data: bytes, addr: tuple) -> None:
         """
@@ -242,50 +359,59 @@ class UDPServer(asyncio.DatagramProtocol):
             data: Received data
             addr: Client address (host, port)
         """
-        client_ip = addr[0]
-        client_port = addr[1]
-
-        logger.debug(f"UDP datagram from {client_ip}:{client_port}")
+        logger.debug("UDP datagram from %s:%s", addr[0], addr[1])
 
         try:
-            # Decode command
-            command_str = data.decode('utf-8').strip()
-
-            # Handle command asynchronously
-            asyncio.create_task(self._handle_datagram(command_str, addr))
-
-        except Exception as e:
-            logger.error(f"Error processing UDP datagram from {client_ip}:{client_port}: {e}")
-
-    async def _handle_datagram(self, command_str: str, addr: tuple) -> None:
+            # Hand off to a worker (parsed directly from bytes)
+            self._queue.put_nowait((data, addr))
+
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logger.warning(
+                    "UDP queue full, dropped datagram from %s:%s (%d dropped so far)",
+                    addr[0], addr[1], self.dropped
+                )
+
+    async def _worker(self) -> None:
+        """Process queued datagrams one at a time"""
+        while True:
+            data, addr = await self._queue.get()
+            await self._handle_datagram(data, addr)
+
+    async def _handle_datagram(self, data: bytes, addr: tuple) -> None:
         """
         Handle UDP datagram asynchronously
 
         Args:
-            command_str: Command string
+            data: Raw datagram payload
             addr: Client address
         """
         client_addr = f"{addr[0]}:{addr[1]}"
 
         try:
             # Process command
-            response = await self.handler.handle_command(command_str, client_addr)
+            response = await self.handler.handle_command(data, client_addr)
 
             # Send response
             if self.transport:
-                self.transport.sendto(response.encode('utf-8') + b'\n', addr)
+                self.transport.sendto(response, addr)
 
         except Exception as e:
-            logger.error(f"Error handling UDP command from {client_addr}: {e}")
+            logger.error("Error handling UDP command from %s: %s", client_addr, e)
 
     def error_received(self, exc: Exception) -> None:
         """Handle errors"""
-        logger.error(f"UDP error: {exc}")
+        logger.error("UDP error: %s", exc)
 
     def connection_lost(self, exc: Optional[Exception]) -> None:
         """Handle connection loss"""
         if exc:
-            logger.error(f"UDP connection lost: {exc}")
+            logger.error("UDP connection lost: %s", exc)
+
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
 
 
 async def start_servers(relay_controller: USBRelayController,
@@ -312,7 +438,8 @@ async def start_servers(relay_controller: USBRelayController,
         tcp_server = TCPServer(
             handler,
             host=config['network']['tcp']['host'],
-            port=config['network']['tcp']['port']
+            port=config['network']['tcp']['port'],
+            idle_timeout=config['network']['tcp'].get('idle_timeout', TCPServer.IDLE_TIMEOUT)
         )
         await tcp_server.start()
 
@@ -333,8 +460,8 @@ async def start_servers(relay_controller: USBRelayController,
         )
 
         logger.info(
-            f"UDP server listening on "
-            f"{config['network']['udp']['host']}:{config['network']['udp']['port']}"
+            "UDP server listening on %s:%s",
+            config['network']['udp']['host'], config['network']['udp']['port']
         )
 
     return tcp_server, udp_transport, udp_protocol
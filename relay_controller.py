@@ -10,14 +10,21 @@ Usage:
 """
 
 import asyncio
+import functools
+import json
 import logging
 import signal
 import sys
-import os
 from pathlib import Path
 from typing import Optional
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    _YamlLoader = yaml.SafeLoader
+
 from usb_relay import USBRelayController, DeviceNotFoundError
 from network_server import start_servers
 
@@ -42,14 +49,15 @@ class RelayControllerApp:
 
     def load_config(self) -> dict:
         """
-        Load configuration from YAML file
+        Load configuration from YAML file (or JSON, by .json suffix)
 
         Returns:
             dict: Configuration dictionary
 
         Raises:
             FileNotFoundError: If config file not found
-            yaml.YAMLError: If config file is invalid
+            yaml.YAMLError: If YAML config file is invalid
+            json.JSONDecodeError: If JSON config file is invalid
         """
         config_file = Path(self.config_path)
 
@@ -57,7 +65,10 @@ class RelayControllerApp:
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
 
         with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+            if config_file.suffix.lower() == '.json':
+                config = json.load(f)
+            else:
+                config = yaml.load(f, Loader=_YamlLoader)
 
         # Validate required fields
         required_fields = ['relay', 'network']
@@ -77,6 +88,11 @@ class RelayControllerApp:
         log_config = self.config.get('logging', {})
         log_level = getattr(logging, log_config.get('level', 'INFO').upper())
 
+        # The format string doesn't use these record fields; skip collecting them
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
         # Create formatters
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -126,7 +142,8 @@ class RelayControllerApp:
             serial_number=relay_config.get('serial_number'),
             num_channels=relay_config.get('channels'),
             auto_reconnect=relay_config.get('auto_reconnect', True),
-            reconnect_interval=relay_config.get('reconnect_interval', 5)
+            reconnect_interval=relay_config.get('reconnect_interval', 5),
+            max_reconnect_attempts=relay_config.get('max_reconnect_attempts')
         )
 
         try:
@@ -146,8 +163,33 @@ class RelayControllerApp:
             self.config
         )
 
+    def reload_config(self) -> None:
+        """
+        Re-read the configuration file and apply the new log level
+
+        Network and relay settings are left as they are; changing them
+        still requires a restart.
+        """
+        logging.info(f"Reloading configuration from {self.config_path}")
+
+        try:
+            config = self.load_config()
+            log_level = getattr(logging, config['logging'].get('level', 'INFO').upper())
+        except Exception as e:
+            logging.error(f"Failed to reload configuration: {e}")
+            return
+
+        self.config = config
+
+        root_logger = logging.getLogger()
+        root_logger.setLevel(log_level)
+        for handler in root_logger.handlers:
+            handler.setLevel(log_level)
+
+        logging.info(f"Configuration reloaded (log level: {logging.getLevelName(log_level)})")
+
     def setup_signal_handlers(self) -> None:
-        """Setup signal handlers for graceful shutdown"""
+        """Setup signal handlers for graceful shutdown and config reload"""
         loop = asyncio.get_event_loop()
 
         def signal_handler(sig):
@@ -155,7 +197,11 @@ class RelayControllerApp:
             self._shutdown_event.set()
 
         for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, lambda s=sig: signal_handler(s))
+            loop.add_signal_handler(sig, functools.partial(signal_handler, sig))
+
+        # SIGHUP reloads the configuration without a restart
+        if hasattr(signal, 'SIGHUP'):
+            loop.add_signal_handler(signal.SIGHUP, self.reload_config)
 
     async def shutdown(self) -> None:
         """Graceful shutdown"""
@@ -189,6 +235,7 @@ class RelayControllerApp:
 
             logging.info("=" * 60)
             logging.info("USB HID Relay Network Controller")
+            logging.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
             logging.info("=" * 60)
 
             # Initialize USB relay
@@ -237,8 +284,19 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use uvloop when installed (optional dependency, not available on Windows)
+    uvloop = None
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+        except ImportError:
+            pass
+
     # Run the application
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         pass
@@ -16,16 +16,145 @@ uses the common DCTTECH/USBRelay protocol which is compatible with most
 USB HID relays (VID:16c0, PID:05df).
 """
 
+from __future__ import annotations
+
 import asyncio
+import errno
 import logging
+import random
 import re
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic as _monotonic
+from typing import Any, Awaitable, Callable, Optional, Dict, List, Tuple
 
 import hid
 
 logger = logging.getLogger(__name__)
 
 
+class _HidTransportQueue:
+    """
+    Shared transport queue for hidapi calls.
+
+    Every controller submits its blocking hidapi calls here. A single
+    consumer task runs them one at a time on one worker thread (hidapi is
+    not re-entrant) and spaces consecutive calls by at least SAFE_INTERVAL,
+    so controllers sharing a bus or hub never hit the driver concurrently.
+    """
+
+    # Minimum gap between two consecutive hidapi calls (seconds)
+    SAFE_INTERVAL = 0.01
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._users = 0
+
+    def acquire(self) -> None:
+        """Register a controller using the queue."""
+        self._users += 1
+
+    async def release(self) -> None:
+        """Unregister a controller; the last one stops the worker."""
+        self._users -= 1
+        if self._users <= 0:
+            self._users = 0
+            await self._stop()
+
+    def submit_nowait(self, func: Callable, *args: Any) -> asyncio.Future:
+        """Queue a call and return a future for its result."""
+        if self._consumer is None or self._consumer.done():
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hid")
+            self._queue = asyncio.Queue()
+            self._consumer = asyncio.create_task(self._consume())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((func, args, future))
+        return future
+
+    async def submit(self, func: Callable, *args: Any) -> Any:
+        """Run a blocking hidapi call through the queue and return its result."""
+        return await self.submit_nowait(func, *args)
+
+    async def _consume(self) -> None:
+        """Run queued calls in order, honouring SAFE_INTERVAL."""
+        loop = asyncio.get_running_loop()
+        next_time = 0.0
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                break  # stop requested; everything before it has run
+            func, args, future = job
+            if future.cancelled():
+                continue
+
+            delay = next_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                result = await loop.run_in_executor(self._executor, func, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            next_time = loop.time() + self.SAFE_INTERVAL
+
+    async def _stop(self) -> None:
+        """Finish queued calls, then stop the consumer and worker thread."""
+        if self._consumer is not None and not self._consumer.done():
+            self._queue.put_nowait(None)
+            await self._consumer
+        self._consumer = None
+        self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_hid_transport = _HidTransportQueue()
+
+# Seconds an enumeration result is reused before hid.enumerate() runs again
+ENUM_CACHE_TTL = 2.0
+
+# Enumeration results shared by all controllers: (vid, pid) -> (timestamp, devices)
+_enum_cache: Dict[Tuple[int, int], Tuple[float, List[dict]]] = {}
+_enum_lock = asyncio.Lock()
+
+
+async def _cached_enumerate(vendor_id: int, product_id: int,
+                            ttl: float = ENUM_CACHE_TTL) -> List[dict]:
+    """
+    Enumerate HID devices, reusing a recent result for the same VID/PID.
+
+    hid.enumerate() queries the descriptor strings of every candidate
+    device, so controllers scanning or reconnecting together share one
+    enumeration per TTL window.
+
+    Args:
+        vendor_id: USB vendor ID
+        product_id: USB product ID
+        ttl: Maximum age of a reused result (seconds)
+    """
+    key = (vendor_id, product_id)
+    async with _enum_lock:
+        cached = _enum_cache.get(key)
+        if cached is not None and _monotonic() - cached[0] < ttl:
+            return cached[1]
+        devices = await _hid_transport.submit(hid.enumerate, vendor_id, product_id)
+        _enum_cache[key] = (_monotonic(), devices)
+        return devices
+
+
+def _invalidate_enumerate_cache(vendor_id: int, product_id: int) -> None:
+    """Drop a cached enumeration result (e.g. after an open failure)."""
+    _enum_cache.pop((vendor_id, product_id), None)
+
+
 class USBRelayError(Exception):
     """Base exception for USB relay errors"""
     pass
@@ -57,11 +186,45 @@ class USBRelayController:
     # Special channel value for ALL channels
     ALL_CHANNELS = 255
 
+    # DCTTECH command bytes (feature report byte 1)
+    CMD_ON = 0xFF       # single channel on (channel in byte 2)
+    CMD_OFF = 0xFD      # single channel off (channel in byte 2)
+    CMD_ALL_ON = 0xFE   # every channel on
+    CMD_ALL_OFF = 0xFC  # every channel off
+
+    # Prebuilt feature reports: (state, channel) -> report for channels 1-8,
+    # and state -> report for the all-channel commands
+    _REPORTS: Dict[Tuple[bool, int], bytes] = {
+        (state, ch): bytes((0x00, cmd, ch, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00))
+        for state, cmd in ((True, CMD_ON), (False, CMD_OFF))
+        for ch in range(1, 9)
+    }
+    _ALL_REPORTS: Dict[bool, bytes] = {
+        True: bytes((0x00, CMD_ALL_ON, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00)),
+        False: bytes((0x00, CMD_ALL_OFF, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00)),
+    }
+
     # How often to scan for new/removed devices (seconds)
     SCAN_INTERVAL = 3
 
+    # Upper bound for the retry delay of a device that fails to open (seconds)
+    MAX_RECONNECT_DELAY = 60
+
+    # Minimum spacing after a relay command before the devices are
+    # accessed again (seconds)
+    COMMAND_INTERVAL = 0.05
+
+    # Attempts for a relay report that fails with a transient error, and the
+    # base of the exponential backoff between them (seconds)
+    SEND_ATTEMPTS = 3
+    SEND_RETRY_DELAY = 0.001
+
+    # Error text from hidapi that means the device is gone (lowercase)
+    _DISCONNECT_MARKERS = ("no such device", "not connected", "not open", "disconnected")
+
     def __init__(self, serial_number: Optional[str] = None, num_channels: Optional[int] = None,
-                 auto_reconnect: bool = True, reconnect_interval: int = 5):
+                 auto_reconnect: bool = True, reconnect_interval: int = 5,
+                 max_reconnect_attempts: Optional[int] = None):
         """
         Initialize USB Relay Controller
 
@@ -69,23 +232,37 @@ class USBRelayController:
             serial_number: Ignored (kept for config compat). All devices are auto-detected.
             num_channels: Override channel count. If None, auto-detected per device.
             auto_reconnect: Enable background device scanning
-            reconnect_interval: Seconds between reconnection attempts (initial)
+            reconnect_interval: Seconds before retrying a device that failed to open
+                (initial; grows with jittered backoff)
+            max_reconnect_attempts: Give up on a device after this many failed
+                opens (None = keep retrying)
         """
         self._configured_channels = num_channels
         self.auto_reconnect = auto_reconnect
         self.reconnect_interval = reconnect_interval
+        self.max_reconnect_attempts = max_reconnect_attempts
 
         # Multi-device state: keyed by device path (bytes)
         self._devices: Dict[bytes, hid.device] = {}
-        self._device_info: Dict[bytes, dict] = {}  # serial, channels, state_cache per device
+        self._device_info: Dict[bytes, dict] = {}  # serial, channels, state_bits, state_time per device
+        self._generation = 0  # bumped whenever a device is added or removed
+        # Accepted channel numbers, rebuilt when the generation moves on
+        self._valid_channels: frozenset = frozenset((self.ALL_CHANNELS,))
+        self._valid_channels_generation = -1
+
+        # hidapi calls block; they run through the shared transport queue's
+        # worker thread so the event loop keeps serving other clients
+        _hid_transport.acquire()
 
         self._lock = asyncio.Lock()
+        self._next_access_time = 0.0  # loop time before which devices are settling
         self._monitor_task: Optional[asyncio.Task] = None
+        self._rescan_event = asyncio.Event()  # set to wake the monitor early
         self._shutdown = False
 
-        # Exponential backoff for when no devices found at all
-        self._reconnect_delay = reconnect_interval
-        self._max_reconnect_delay = 60
+        # Retry backoff for enumerated devices that failed to open:
+        # path -> {'attempts': int, 'delay': float, 'next_time': loop time}
+        self._open_retries: Dict[bytes, dict] = {}
 
         logger.info("Initialized USB Relay Controller (multi-device mode)")
 
@@ -130,83 +307,132 @@ class USBRelayController:
             return first.get('serial', None)
         return None
 
-    def _open_device(self, enum_info: dict) -> Optional[bytes]:
+    async def _run_hid(self, func: Callable, *args: Any) -> Any:
+        """Run a blocking hidapi call through the shared HID transport queue."""
+        return await _hid_transport.submit(func, *args)
+
+    def _probe_device(self, enum_info: dict) -> Tuple[hid.device, dict]:
         """
-        Open a single HID device and register it.
+        Open a HID device and read its serial, channel count and state.
+
+        Runs on the HID worker thread; does not touch controller state.
 
         Args:
             enum_info: Device info dict from hid.enumerate()
 
         Returns:
-            Device path if opened successfully, None otherwise.
+            (device handle, device info dict)
         """
-        path = enum_info['path']
-        if path in self._devices:
-            return None  # Already open
+        dev = hid.device()
+        dev.open_path(enum_info['path'])
 
-        try:
-            dev = hid.device()
-            dev.open_path(path)
-
-            # Determine serial number
-            serial = enum_info.get('serial_number', '')
-            if not serial:
-                try:
-                    serial = dev.get_serial_number_string() or ''
-                except Exception:
-                    pass
-            if not serial:
-                try:
-                    report = dev.get_feature_report(0x01, 9)
-                    if report and len(report) >= 5:
-                        serial = bytes(report[:5]).decode('ascii', errors='ignore').strip('\x00')
-                except Exception:
-                    serial = 'unknown'
-
-            # Determine channel count
-            if self._configured_channels is not None:
-                channels = self._configured_channels
-            else:
-                try:
-                    product = dev.get_product_string() or ''
-                    channels = self._detect_channels(product)
-                except Exception:
-                    channels = 8
-
-            # Read initial state
-            state_cache: Dict[int, bool] = {}
+        # Determine serial number
+        serial = enum_info.get('serial_number', '')
+        if not serial:
             try:
-                report = dev.get_feature_report(0x01, 9)
-                if report and len(report) >= 8:
-                    state_byte = report[7]
-                    for ch in range(1, channels + 1):
-                        state_cache[ch] = bool(state_byte & (1 << (ch - 1)))
+                serial = dev.get_serial_number_string() or ''
             except Exception:
                 pass
+        if not serial:
+            try:
+                report = dev.get_feature_report(0x01, 9)
+                if report and len(report) >= 5:
+                    serial = bytes(report[:5]).decode('ascii', errors='ignore').strip('\x00')
+            except Exception:
+                serial = 'unknown'
 
-            self._devices[path] = dev
-            self._device_info[path] = {
-                'serial': serial,
-                'channels': channels,
-                'state_cache': state_cache,
-            }
+        # Determine channel count
+        if self._configured_channels is not None:
+            channels = self._configured_channels
+        else:
+            try:
+                product = dev.get_product_string() or ''
+                channels = self._detect_channels(product)
+            except Exception:
+                channels = 8
+
+        # Read initial state (bit N-1 set = channel N open)
+        state_bits = 0
+        state_time = 0.0  # monotonic time the bits were last known good
+        try:
+            report = dev.get_feature_report(0x01, 9)
+            if report and len(report) >= 8:
+                state_bits = report[7] & ((1 << channels) - 1)
+                state_time = _monotonic()
+        except Exception:
+            pass
 
-            logger.info(f"Opened device: serial={serial}, channels={channels}, path={path}")
-            return path
+        return dev, {
+            'serial': serial,
+            'channels': channels,
+            'state_bits': state_bits,
+            'state_time': state_time,
+        }
 
+    @staticmethod
+    def _state_dict(state_bits: int, channels: int) -> Dict[int, bool]:
+        """Expand a device's packed state bits into {channel: state}."""
+        return {ch: bool(state_bits >> (ch - 1) & 1) for ch in range(1, channels + 1)}
+
+    async def _open_device(self, enum_info: dict) -> Optional[bytes]:
+        """
+        Open a single HID device and register it.
+
+        Args:
+            enum_info: Device info dict from hid.enumerate()
+
+        Returns:
+            Device path if opened successfully, None otherwise.
+        """
+        path = enum_info['path']
+        if path in self._devices:
+            return None  # Already open
+
+        try:
+            dev, info = await self._run_hid(self._probe_device, enum_info)
         except Exception as e:
-            logger.error(f"Failed to open device at {path}: {e}")
+            logger.error("Failed to open device at %s: %s", path, e)
+            _invalidate_enumerate_cache(self.VENDOR_ID, self.PRODUCT_ID)
             return None
 
+        self._devices[path] = dev
+        self._device_info[path] = info
+        self._generation += 1
+
+        logger.info(
+            "Opened device: serial=%s, channels=%s, path=%s",
+            info['serial'], info['channels'], path
+        )
+        return path
+
     def _close_device(self, path: bytes) -> None:
         """Close and unregister a single device."""
         dev = self._devices.pop(path, None)
         self._device_info.pop(path, None)
         if dev:
-            try:
-                dev.close()
-            except Exception:
-                pass
+            self._generation += 1
+            # Queued behind any pending call on the shared HID transport
+            _hid_transport.submit_nowait(self._close_handle, dev)
+
+    def _remove_devices(self, paths: List[bytes], reason: str) -> None:
+        """Log and close devices that stopped responding, then wake the monitor."""
+        for path in paths:
+            serial = self._device_info.get(path, {}).get('serial', '?')
+            logger.warning("Removing device [%s]: %s", serial, reason)
+            self._close_device(path)
+        if paths:
+            # Rescan now (a replugged device comes back without waiting for
+            # the next SCAN_INTERVAL) against a fresh enumeration
+            _invalidate_enumerate_cache(self.VENDOR_ID, self.PRODUCT_ID)
+            self._rescan_event.set()
+
+    @staticmethod
+    def _close_handle(dev: hid.device) -> None:
+        """Close a HID handle, ignoring errors (device may be gone)."""
+        try:
+            dev.close()
+        except Exception:
+            pass
 
     async def connect(self) -> bool:
         """
@@ -217,24 +443,25 @@ class USBRelayController:
         Raises:
             DeviceNotFoundError: If no devices found
         """
-        async with self._lock:
-            enum_list = hid.enumerate(self.VENDOR_ID, self.PRODUCT_ID)
+        # Enumeration touches no open handle, so relay commands are not
+        # held up behind it
+        enum_list = await _cached_enumerate(self.VENDOR_ID, self.PRODUCT_ID)
 
-            if not enum_list:
-                raise DeviceNotFoundError(
-                    f"No USB relay devices found (VID:{self.VENDOR_ID:04x}, PID:{self.PRODUCT_ID:04x})"
-                )
+        if not enum_list:
+            raise DeviceNotFoundError(
+                f"No USB relay devices found (VID:{self.VENDOR_ID:04x}, PID:{self.PRODUCT_ID:04x})"
+            )
 
+        async with self._lock:
             opened = 0
             for info in enum_list:
-                if self._open_device(info) is not None:
+                if await self._open_device(info) is not None:
                     opened += 1
 
             if not self._devices:
                 raise DeviceNotFoundError("Found devices but failed to open any")
 
-            self._reconnect_delay = self.reconnect_interval
-            logger.info(f"Connected to {len(self._devices)} device(s) (newly opened: {opened})")
+            logger.info("Connected to %d device(s) (newly opened: %d)", len(self._devices), opened)
             return True
 
     async def disconnect(self) -> None:
@@ -245,9 +472,51 @@ class USBRelayController:
                 self._close_device(path)
             logger.info("Disconnected from all USB relay devices")
 
+    def _schedule_open_retry(self, path: bytes) -> None:
+        """
+        Back off before retrying a device that failed to open.
+
+        Uses decorrelated jitter so controllers sharing a flaky hub don't
+        retry in lockstep; the first retry waits reconnect_interval.
+        """
+        retry = self._open_retries.get(path)
+        if retry is None:
+            retry = self._open_retries[path] = {
+                'attempts': 0, 'delay': self.reconnect_interval, 'next_time': 0.0,
+            }
+        else:
+            retry['delay'] = min(
+                self.MAX_RECONNECT_DELAY,
+                random.uniform(self.reconnect_interval, retry['delay'] * 3)
+            )
+        retry['attempts'] += 1
+        retry['next_time'] = asyncio.get_running_loop().time() + retry['delay']
+
+        if self._open_retries_exhausted(retry):
+            logger.error(
+                "Giving up on device at %s after %d failed attempts", path, retry['attempts']
+            )
+        else:
+            logger.debug("Retrying device at %s in %.1fs", path, retry['delay'])
+
+    def _open_retries_exhausted(self, retry: dict) -> bool:
+        """True if a device has used up max_reconnect_attempts."""
+        return (self.max_reconnect_attempts is not None
+                and retry['attempts'] >= self.max_reconnect_attempts)
+
+    async def _wait_command_interval(self) -> None:
+        """Sleep only for whatever remains of the last command's interval."""
+        delay = self._next_access_time - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
     def _validate_channel(self, channel: int) -> None:
         """Validate channel number against max channels across all devices."""
-        if channel == self.ALL_CHANNELS:
+        if self._valid_channels_generation != self._generation:
+            nc = self.num_channels
+            self._valid_channels = frozenset(range(1, (nc or 0) + 1)) | {self.ALL_CHANNELS}
+            self._valid_channels_generation = self._generation
+        if channel in self._valid_channels:
             return
         nc = self.num_channels
         if nc is None:
@@ -257,9 +526,91 @@ class USBRelayController:
                 f"Channel {channel} is invalid. Valid range: 1-{nc} or {self.ALL_CHANNELS} for all"
             )
 
+    def _channel_report(self, channel: int, state: bool) -> bytes:
+        """Feature report switching one channel on or off."""
+        report = self._REPORTS.get((state, channel))
+        if report is None:
+            state_byte = self.CMD_ON if state else self.CMD_OFF
+            report = bytes((0x00, state_byte, channel, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00))
+        return report
+
     async def _send_relay_command(self, channel: int, state: bool) -> bool:
         """
-        Send relay control command to ALL connected devices.
+        Send relay control command for one channel to ALL connected devices.
+
+        Returns:
+            bool: True if at least one device succeeded
+        """
+        report = self._channel_report(channel, state)
+        bit = 1 << (channel - 1)
+
+        async def apply(dev: hid.device, info: dict) -> int:
+            await self._send_report(dev, report)
+            return info['state_bits'] | bit if state else info['state_bits'] & ~bit
+
+        return await self._apply_to_devices(apply)
+
+    async def _send_all_command(self, state: bool) -> bool:
+        """
+        Switch every channel on ALL connected devices.
+
+        Returns:
+            bool: True if at least one device succeeded
+        """
+        async def apply(dev: hid.device, info: dict) -> int:
+            await self._switch_all(dev, info, state)
+            return (1 << info['channels']) - 1 if state else 0
+
+        return await self._apply_to_devices(apply)
+
+    async def _switch_all(self, dev: hid.device, info: dict, state: bool) -> None:
+        """
+        Switch channels 1..channels of one device on or off.
+
+        The all-channel report switches every physical relay, so it is only
+        used when the channel count was auto-detected. A configured
+        relay.channels may be below the board's count; then only channels
+        1..channels are switched, one report each.
+        """
+        if self._configured_channels is None:
+            await self._send_report(dev, self._ALL_REPORTS[state])
+        else:
+            for ch in range(1, info['channels'] + 1):
+                await self._send_report(dev, self._channel_report(ch, state))
+
+    @classmethod
+    def _is_disconnect_error(cls, error: Exception) -> bool:
+        """True if a hidapi error means the device was unplugged or closed."""
+        if isinstance(error, OSError) and error.errno == errno.ENODEV:
+            return True
+        message = str(error).lower()
+        return any(marker in message for marker in cls._DISCONNECT_MARKERS)
+
+    async def _send_report(self, dev: hid.device, report: bytes) -> None:
+        """
+        Send a feature report, retrying transient errors in place.
+
+        Raises:
+            Exception: The hidapi error, at once if the device is gone or
+                after SEND_ATTEMPTS failed attempts otherwise
+        """
+        for attempt in range(self.SEND_ATTEMPTS):
+            try:
+                await self._run_hid(dev.send_feature_report, report)
+                return
+            except Exception as e:
+                if self._is_disconnect_error(e) or attempt == self.SEND_ATTEMPTS - 1:
+                    raise
+                logger.debug("Transient send error, retrying: %s", e)
+                await asyncio.sleep(self.SEND_RETRY_DELAY * (1 << attempt))
+
+    async def _apply_to_devices(self, apply: Callable[[hid.device, dict], Awaitable[int]]) -> bool:
+        """
+        Run a relay command on ALL connected devices and update their caches.
+
+        Args:
+            apply: Coroutine function taking (device, info) that sends the
+                device's reports and returns its new state bits
 
         Returns:
             bool: True if at least one device succeeded
@@ -267,33 +618,29 @@ class USBRelayController:
         if not self._devices:
             raise DeviceNotFoundError("No devices connected")
 
-        state_byte = 0xFF if state else 0xFD
-        report = [0x00, state_byte, channel, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]
+        await self._wait_command_interval()
 
         any_success = False
         failed_paths: List[bytes] = []
 
         for path, dev in list(self._devices.items()):
+            info = self._device_info.get(path)
+            if not info:
+                continue
             try:
-                dev.send_feature_report(report)
-                # Update per-device state cache
-                info = self._device_info.get(path)
-                if info:
-                    info['state_cache'][channel] = state
+                info['state_bits'] = await apply(dev, info)
+                info['state_time'] = _monotonic()
                 any_success = True
             except Exception as e:
-                serial = self._device_info.get(path, {}).get('serial', '?')
-                logger.error(f"Error sending command to device [{serial}]: {e}")
+                logger.error("Error sending command to device [%s]: %s", info['serial'], e)
                 failed_paths.append(path)
 
-        # Remove failed devices
-        for path in failed_paths:
-            serial = self._device_info.get(path, {}).get('serial', '?')
-            logger.warning(f"Removing failed device [{serial}]")
-            self._close_device(path)
+        self._remove_devices(failed_paths, "command failed")
 
         if any_success:
-            await asyncio.sleep(0.05)
+            self._next_access_time = (
+                asyncio.get_running_loop().time() + self.COMMAND_INTERVAL
+            )
 
         return any_success
 
@@ -301,41 +648,74 @@ class USBRelayController:
         """Open (activate) a relay channel on all devices"""
         async with self._lock:
             self._validate_channel(channel)
-            logger.debug(f"Opening channel {channel}")
+            logger.debug("Opening channel %d", channel)
             return await self._send_relay_command(channel, True)
 
     async def close_channel(self, channel: int) -> bool:
         """Close (deactivate) a relay channel on all devices"""
         async with self._lock:
             self._validate_channel(channel)
-            logger.debug(f"Closing channel {channel}")
+            logger.debug("Closing channel %d", channel)
             return await self._send_relay_command(channel, False)
 
     async def open_all_channels(self) -> bool:
         """Open all relay channels on all devices"""
         async with self._lock:
-            nc = self.num_channels
-            if nc is None:
-                raise DeviceNotFoundError("No devices connected")
             logger.debug("Opening all channels")
-            success = True
-            for ch in range(1, nc + 1):
-                if not await self._send_relay_command(ch, True):
-                    success = False
-            return success
+            return await self._send_all_command(True)
 
     async def close_all_channels(self) -> bool:
         """Close all relay channels on all devices"""
         async with self._lock:
-            nc = self.num_channels
-            if nc is None:
-                raise DeviceNotFoundError("No devices connected")
             logger.debug("Closing all channels")
-            success = True
-            for ch in range(1, nc + 1):
-                if not await self._send_relay_command(ch, False):
-                    success = False
-            return success
+            return await self._send_all_command(False)
+
+    async def set_channels_mask(self, mask: int) -> bool:
+        """
+        Set every channel at once from a bit mask on all devices.
+
+        DCTTECH boards have no "write mask" command, so each device gets the
+        fewest reports that reach the target: a full or empty mask switches
+        all channels (see _switch_all), otherwise one report goes out per
+        channel that differs from its current state. For a partial mask the
+        devices are read first, since the cache may miss changes made outside
+        this process.
+
+        Args:
+            mask: Target state, bit N-1 set = channel N open
+
+        Returns:
+            bool: True if at least one device succeeded
+        """
+        async with self._lock:
+            if not self._devices:
+                raise DeviceNotFoundError("No devices connected")
+            nc = self.num_channels
+            if not (0 <= mask < (1 << nc)):
+                raise InvalidChannelError(
+                    f"Channel mask 0x{mask:x} is invalid. Valid range: 0-0x{(1 << nc) - 1:x}"
+                )
+            logger.debug("Setting channel mask 0x%02x", mask)
+
+            # Diffing needs the real state; only all-on/all-off can skip the read
+            if any(0 < mask & ((1 << info['channels']) - 1) < (1 << info['channels']) - 1
+                   for info in self._device_info.values()):
+                await self._refresh_states()
+
+            async def apply(dev: hid.device, info: dict) -> int:
+                full = (1 << info['channels']) - 1
+                target = mask & full
+                if target == full or target == 0:
+                    await self._switch_all(dev, info, target != 0)
+                    return target
+                changed = target ^ info['state_bits']
+                for ch in range(1, info['channels'] + 1):
+                    if changed >> (ch - 1) & 1:
+                        report = self._channel_report(ch, bool(target >> (ch - 1) & 1))
+                        await self._send_report(dev, report)
+                return target
+
+            return await self._apply_to_devices(apply)
 
     async def _update_device_state(self, path: bytes) -> bool:
         """
@@ -350,19 +730,54 @@ class USBRelayController:
             return False
 
         try:
-            report = dev.get_feature_report(0x01, 9)
+            report = await self._run_hid(dev.get_feature_report, 0x01, 9)
             if report and len(report) >= 8:
-                state_byte = report[7]
-                for ch in range(1, info['channels'] + 1):
-                    info['state_cache'][ch] = bool(state_byte & (1 << (ch - 1)))
+                info['state_bits'] = report[7] & ((1 << info['channels']) - 1)
+                info['state_time'] = _monotonic()
             return True
         except Exception:
             return False
 
-    async def get_status(self) -> Dict[str, Dict[int, bool]]:
+    async def _refresh_states(self, max_age: Optional[float] = None) -> None:
+        """
+        Re-read devices whose cached state is older than max_age seconds.
+
+        Devices that fail the read are removed.
+
+        Args:
+            max_age: Oldest cached state (seconds) kept without a read,
+                or None to read every device
+        """
+        now = _monotonic()
+        stale = [
+            path for path, info in self._device_info.items()
+            if max_age is None or now - info['state_time'] > max_age
+        ]
+        if not stale:
+            return
+
+        await self._wait_command_interval()
+
+        failed_paths: List[bytes] = []
+        for path in stale:
+            if not await self._update_device_state(path):
+                failed_paths.append(path)
+
+        self._remove_devices(failed_paths, "status read failed")
+
+    async def get_status(self, refresh: bool = False,
+                         max_age: float = 1.0) -> Dict[str, Dict[int, bool]]:
         """
         Get status of all relay channels on all devices.
 
+        Successful commands and the monitor's health check keep the per-device
+        state up to date, so devices are only read when their state is older
+        than max_age seconds.
+
+        Args:
+            refresh: Read every device regardless of the state's age
+            max_age: Oldest cached state (seconds) returned without a read
+
         Returns:
             Dict mapping device serial to {channel: state} dict.
             Example: {"959BI": {1: True, 2: False}, "ABCDE": {1: False, 2: True}}
@@ -371,69 +786,93 @@ class USBRelayController:
             if not self._devices:
                 raise DeviceNotFoundError("No devices connected")
 
-            result: Dict[str, Dict[int, bool]] = {}
-            failed_paths: List[bytes] = []
-
-            for path in list(self._devices.keys()):
-                info = self._device_info.get(path)
-                if not info:
-                    continue
+            await self._refresh_states(None if refresh else max_age)
 
-                if await self._update_device_state(path):
-                    result[info['serial']] = dict(info['state_cache'])
-                else:
-                    failed_paths.append(path)
-
-            for path in failed_paths:
-                serial = self._device_info.get(path, {}).get('serial', '?')
-                logger.warning(f"Removing unresponsive device [{serial}]")
-                self._close_device(path)
-
-            if not result and not self._devices:
+            if not self._devices:
                 raise DeviceNotFoundError("All devices became unresponsive")
 
-            return result
+            return {
+                info['serial']: self._state_dict(info['state_bits'], info['channels'])
+                for info in self._device_info.values()
+            }
 
     async def _monitor_loop(self) -> None:
         """
         Background task: health-check existing devices and scan for new ones.
-        Runs every SCAN_INTERVAL seconds.
+        Runs every SCAN_INTERVAL seconds, or as soon as a device is removed.
         """
         while not self._shutdown:
-            await asyncio.sleep(self.SCAN_INTERVAL)
+            try:
+                await asyncio.wait_for(self._rescan_event.wait(), self.SCAN_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._rescan_event.clear()
             if self._shutdown:
                 break
 
             async with self._lock:
-                # 1) Health-check existing devices
+                # 1) Health-check existing devices (refreshes their cached state).
+                # Like every other access, let a just-switched relay settle first.
+                await self._wait_command_interval()
                 failed_paths: List[bytes] = []
-                for path, dev in list(self._devices.items()):
-                    try:
-                        dev.get_feature_report(0x01, 9)
-                    except Exception:
+                for path in list(self._devices):
+                    if not await self._update_device_state(path):
                         failed_paths.append(path)
 
-                for path in failed_paths:
-                    serial = self._device_info.get(path, {}).get('serial', '?')
-                    logger.warning(f"Device [{serial}] health check failed, removing")
-                    self._close_device(path)
-
-                # 2) Scan for new devices
-                try:
-                    enum_list = hid.enumerate(self.VENDOR_ID, self.PRODUCT_ID)
-                    for info in enum_list:
-                        if info['path'] not in self._devices:
-                            result = self._open_device(info)
-                            if result:
-                                serial = self._device_info[result]['serial']
-                                logger.info(f"New device detected and opened: [{serial}]")
-                except Exception as e:
-                    logger.debug(f"Device scan error: {e}")
+                self._remove_devices(failed_paths, "health check failed")
+                self._rescan_event.clear()  # the scan below covers these
+
+            # 2) Scan for new devices. Enumeration runs without the lock so
+            # relay commands are not held up behind it; only opens take it.
+            try:
+                enum_list = await _cached_enumerate(self.VENDOR_ID, self.PRODUCT_ID)
+            except Exception as e:
+                logger.debug("Device scan error: %s", e)
+                continue
+
+            async with self._lock:
+                now = asyncio.get_running_loop().time()
+                present = set()
+                for info in enum_list:
+                    path = info['path']
+                    present.add(path)
+                    if path in self._devices:
+                        continue
+
+                    # Devices that failed to open are retried with backoff
+                    retry = self._open_retries.get(path)
+                    if retry is not None and (
+                            now < retry['next_time'] or self._open_retries_exhausted(retry)):
+                        continue
+
+                    result = await self._open_device(info)
+                    if result:
+                        self._open_retries.pop(path, None)
+                        serial = self._device_info[result]['serial']
+                        logger.info("New device detected and opened: [%s]", serial)
+                    else:
+                        self._schedule_open_retry(path)
+
+                # Unplugged devices start over when they come back
+                for path in list(self._open_retries):
+                    if path not in present:
+                        del self._open_retries[path]
 
     async def start_monitor(self) -> None:
-        """Start the background device monitor task"""
-        if self.auto_reconnect and (self._monitor_task is None or self._monitor_task.done()):
+        """Start the background device monitor task (at most one runs)"""
+        if self._shutdown or not self.auto_reconnect:
+            return
+        # No await between the check and the assignment, so concurrent
+        # callers cannot both start a monitor
+        if self._monitor_task is None or self._monitor_task.done():
             self._monitor_task = asyncio.create_task(self._monitor_loop())
+            self._monitor_task.add_done_callback(self._on_monitor_done)
+
+    @staticmethod
+    def _on_monitor_done(task: asyncio.Task) -> None:
+        """Report a monitor task that died instead of exiting on shutdown."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Device monitor stopped unexpectedly", exc_info=task.exception())
 
     async def start_reconnect_monitor(self) -> None:
         """Alias for start_monitor"""
@@ -441,6 +880,8 @@ class USBRelayController:
 
     async def shutdown(self) -> None:
         """Shutdown the controller and cleanup resources"""
+        if self._shutdown:
+            return  # already shut down; don't release the HID transport twice
         logger.info("Shutting down USB relay controller")
         self._shutdown = True
 
@@ -452,3 +893,6 @@ class USBRelayController:
                 pass
 
         await self.disconnect()
+
+        # Queued handle closes finish before the last user stops the worker
+        await _hid_transport.release()